@@ -1,3 +1,4 @@
+import argparse
 import logging
 import pandas as pd
 import requests
@@ -11,12 +12,16 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../../"))
 # add project root to sys.path
 sys.path.append(PROJECT_ROOT)
 
+from utils.archive import replay, store_page, url_slug
 from utils.io import save_to_csv
 from bs4 import BeautifulSoup
 
 
 # url and path constants
 URL = "https://www.worldfootball.net/venues/champions-league-2023-2024/"
+# each site keeps its own archive, its pages only parse with this script's parser
+ARCHIVE_DIR = "../../data/archive/worldfootball"
+REPLAY_DIR = "../../data/raw/replayed/stadiums"
 SAVE_PATH = "../../data/raw/stadiums.csv"
 
 
@@ -24,12 +29,20 @@ def get_html(url: str) -> bytes:
     """fetch html content from a url"""
     try:
         response = requests.get(url)
+        response.raise_for_status()
         logging.info("successfully got the webpage")
-        return response.content
     except requests.RequestException as e:
         logging.error(f"error getting the page: {e}")
         return None
-    
+
+    # a failed archive write should not lose a page that was fetched fine
+    try:
+        store_page(ARCHIVE_DIR, url, response.content)
+    except OSError:
+        logging.warning("continuing without archiving the page")
+
+    return response.content
+
 
 def parse_table(html_data: str) -> pd.DataFrame:
     """parse html content and return it as a dataframe"""
@@ -58,14 +71,60 @@ def parse_table(html_data: str) -> pd.DataFrame:
         return None
 
 
+def get_archived_table(url: str) -> pd.DataFrame:
+    """re-parse the latest archived copy of a url without touching the network"""
+    tables = replay(ARCHIVE_DIR, parse_table, urls=[url])
+    return tables.get(url)
+
+
+def replay_archive(workers: int = None) -> int:
+    """re-parse every archived page in parallel and save each table under REPLAY_DIR"""
+    tables = replay(ARCHIVE_DIR, parse_table, workers=workers)
+
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    saved = 0
+    for url, df in tables.items():
+        if df is None:
+            logging.error(f"failed to parse archived page for {url}")
+            continue
+        save_to_csv(df, os.path.join(REPLAY_DIR, f"{url_slug(url)}.csv"))
+        saved += 1
+
+    return saved
+
+
 def main():
     """set up data acquisition process"""
-    html_data = get_html(URL)
-    if not html_data:
-        logging.error("failed to get html data")
+    parser = argparse.ArgumentParser(description="acquire stadium data")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--replay",
+        action="store_true",
+        help="re-parse the archived page instead of fetching it",
+    )
+    mode.add_argument(
+        "--replay-all",
+        action="store_true",
+        help="re-parse every archived page in parallel into the replayed folder",
+    )
+    parser.add_argument("--workers", type=int, help="number of replay processes")
+    args = parser.parse_args()
+
+    if args.replay_all:
+        saved = replay_archive(args.workers)
+        logging.info(f"replayed {saved} archived pages")
         return
 
-    stadium_data_df = parse_table(html_data)
+    if args.replay:
+        stadium_data_df = get_archived_table(URL)
+    else:
+        html_data = get_html(URL)
+        if not html_data:
+            logging.error("failed to get html data")
+            return
+
+        stadium_data_df = parse_table(html_data)
+
     if stadium_data_df is None:
         logging.error("failed to parse stadium data")
         return
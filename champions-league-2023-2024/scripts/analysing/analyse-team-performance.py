@@ -1,3 +1,4 @@
+import argparse
 import pandas as pd
 import logging
 import sys
@@ -10,7 +11,10 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../../"))
 # add project root to sys.path
 sys.path.append(PROJECT_ROOT)
 
-from utils.io import load_data, save_to_csv
+from utils.aggregate import add_away_country, add_distance_band, aggregate_views
+from utils.engine import ENGINES, get_engine
+from utils.io import save_to_csv
+from utils.shared import as_frame
 
 
 # configure logging
@@ -24,44 +28,125 @@ logging.basicConfig(
 # transformed and analysed data paths
 TRANSFORMED_DATA_PATH = "../../data/processed/transformed/matches-stadiums.csv"
 ANALYSED_DATA_PATH = "../../data/analysed/distance-points.csv"
-
-
-def analyse_away_team_performance(df: pd.DataFrame) -> pd.DataFrame:
-    """analyse the correlation between away teams' perfomance and travel distance"""
+VIEWS_DIR = "../../data/analysed/views"
+
+# season covered by the transformed data
+SEASON = "2023-2024"
+
+# lower bounds of the travel distance bands in km
+DISTANCE_BANDS = [0, 1000, 2000, 3000]
+
+# columns summed per away team for the figure
+DISTANCE_POINTS_COLUMNS = ["Travel Distance", "Away Points"]
+
+# metrics shared by the away views
+AWAY_METRICS = {
+    "Matches": ("count",),
+    "Travel Distance": ("sum", "Travel Distance"),
+    "Away Points": ("sum", "Away Points"),
+    "Mean Away Points": ("mean", "Away Points"),
+    "Points per 1000 km": ("per_1000", "Away Points", "Travel Distance"),
+}
+
+# additional views computed in the same scan
+VIEWS = [
+    {"name": "away-teams", "by": ["Away"], "metrics": AWAY_METRICS},
+    {
+        "name": "home-teams",
+        "by": ["Home"],
+        "metrics": {
+            "Matches": ("count",),
+            "Home Points": ("sum", "Home Points"),
+            "Mean Home Points": ("mean", "Home Points"),
+        },
+    },
+    {
+        "name": "home-vs-away",
+        "by": ["Season"],
+        "metrics": {
+            "Matches": ("count",),
+            "Home Points": ("sum", "Home Points"),
+            "Away Points": ("sum", "Away Points"),
+            "Mean Home Points": ("mean", "Home Points"),
+            "Mean Away Points": ("mean", "Away Points"),
+        },
+    },
+    {"name": "away-countries", "by": ["Away Country"], "metrics": AWAY_METRICS},
+    {"name": "distance-bands", "by": ["Distance Band"], "metrics": AWAY_METRICS},
+    {
+        "name": "season-away-countries",
+        "by": ["Season", "Away Country"],
+        "metrics": AWAY_METRICS,
+    },
+]
+
+
+def add_group_keys(df: pd.DataFrame) -> pd.DataFrame:
+    """add the season, away country and distance band keys used by the views"""
+    if "Season" not in df.columns:
+        df["Season"] = SEASON
+    df = add_away_country(df)
+    return add_distance_band(df, DISTANCE_BANDS)
+
+
+def analyse_views(df, views: list) -> dict:
+    """compute several aggregated views of the matches in a single scan
+
+    df may also be a shared memory handle or an arrow ipc path, so worker
+    processes can map the matches without a pickled copy.
+    """
     try:
-        logging.info("analysing away team performance")
+        logging.info("analysing team performance views")
 
-        away_distance_df = df[["Away", "Travel Distance", "Away Points"]]
-        result_df = (
-            away_distance_df.groupby("Away")
-            .sum()
-            .sort_values("Travel Distance", ascending=False)
-            .reset_index()
-        )
-
-        return result_df
+        # a shallow copy keeps the key columns off the caller's frame
+        df = add_group_keys(as_frame(df).copy(deep=False))
+        return aggregate_views(df, views)
     except Exception as e:
-        logging.error(f"error analysing away team performance: {e}")
+        logging.error(f"error analysing team performance views: {e}")
         raise
 
 
+def analyse_away_team_performance(engine, frame):
+    """sum travel distance and away points per away team, longest trips first"""
+    logging.info("analysing away team performance")
+    away_distance = engine.select(frame, ["Away"] + DISTANCE_POINTS_COLUMNS)
+    totals = engine.group_sum(away_distance, ["Away"], DISTANCE_POINTS_COLUMNS)
+    return engine.sort(totals, "Travel Distance", descending=True)
+
+
 def main():
     """set up data analysis process"""
+    parser = argparse.ArgumentParser(description="analyse away team performance")
+    parser.add_argument("--engine", choices=ENGINES, default="pandas")
+    args = parser.parse_args()
+
     logging.info("starting data analysis process")
 
     try:
-        # load data
-        df = load_data(TRANSFORMED_DATA_PATH)
+        # load data once for both the engine totals and the views
+        engine = get_engine(args.engine)
+        frame = engine.materialise(engine.load(TRANSFORMED_DATA_PATH))
 
-        # analyse data
-        result_df = analyse_away_team_performance(df)
+        # sum per away team with the engine
+        result = engine.to_pandas(analyse_away_team_performance(engine, frame))
+        df = engine.to_pandas(frame)
+
+        # the views share one numpy scan of the matches
+        views = analyse_views(df, VIEWS)
 
         # save analysed data
-        save_to_csv(result_df, ANALYSED_DATA_PATH)
+        save_to_csv(result, ANALYSED_DATA_PATH)
+        os.makedirs(VIEWS_DIR, exist_ok=True)
+        for name, view_df in views.items():
+            save_to_csv(view_df, os.path.join(VIEWS_DIR, f"{name}.csv"))
         logging.info("data analysis was successful!")
     except Exception as e:
         logging.error(f"data analysis process failed: {e}")
 
+        # a caller that imported the stage, such as the watcher, needs the failure
+        if __name__ != "__main__":
+            raise
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,121 @@
+import importlib.util
+import logging
+import os
+import sys
+import time
+
+import pandas as pd
+
+# get the absolute path of the project root (two levels up from current script)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../../"))
+
+# add project root to sys.path
+sys.path.append(PROJECT_ROOT)
+
+from utils.engine import ENGINES, get_engine
+from utils.io import load_data, save_to_csv
+from utils.rules import compile_rules, load_rules, remap_values, select_rows
+
+
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+# define constants
+# stage inputs, rules and the analysis script whose engine pass is timed
+RAW_DATA_PATH = "../../data/raw/matches.csv"
+MATCH_DATA_PATH = "../../data/processed/cleansed/matches.csv"
+STADIUMS_DATA_PATH = "../../data/processed/cleansed/stadiums.csv"
+TRANSFORMED_DATA_PATH = "../../data/processed/transformed/matches-stadiums.csv"
+RULES_PATH = "../../config/cleansing/matches.json"
+ANALYSIS_SCRIPT_PATH = "../analysing/analyse-team-performance.py"
+
+# scaled copies of the stage inputs
+BENCHMARK_PATH = "../../data/processed/benchmark-{name}.csv"
+
+# how many times the season is repeated to grow the input
+SCALES = [1, 100, 1000, 10000]
+
+
+def load_script(path: str):
+    """import a pipeline script as a module to reuse its stage functions"""
+    spec = importlib.util.spec_from_file_location("stage", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def cleanse_matches(engine, paths: dict, plan: dict, analysis) -> pd.DataFrame:
+    """the cleansing stage's engine passes: filters, column drops and remaps"""
+    df = select_rows(engine, engine.load(paths["raw"]), plan, {})
+    return engine.to_pandas(remap_values(engine, df, plan, {}))
+
+
+def merge_matches(engine, paths: dict, plan: dict, analysis) -> pd.DataFrame:
+    """the transform stage's engine pass: matches joined to their stadiums"""
+    matches = engine.load(paths["cleansed"])
+    stadiums = engine.load(STADIUMS_DATA_PATH)
+    return engine.to_pandas(engine.merge(matches, stadiums, on="Venue", how="inner"))
+
+
+def analyse_matches(engine, paths: dict, plan: dict, analysis) -> pd.DataFrame:
+    """the analysis stage's engine pass: one read, away totals and the matches"""
+    frame = engine.materialise(engine.load(paths["transformed"]))
+    result = engine.to_pandas(analysis.analyse_away_team_performance(engine, frame))
+    engine.to_pandas(frame)
+    return result
+
+
+# stage passes timed on every engine and the input each one grows with
+STAGES = {
+    "cleanse": (cleanse_matches, "raw"),
+    "transform": (merge_matches, "cleansed"),
+    "analyse": (analyse_matches, "transformed"),
+}
+
+
+def main():
+    """time the stages' engine passes on every engine as the input grows"""
+    logging.info("starting engine benchmark")
+    logging.getLogger().setLevel(logging.WARNING)
+
+    plan = compile_rules(load_rules(RULES_PATH))
+    analysis = load_script(ANALYSIS_SCRIPT_PATH)
+    seasons = {
+        "raw": load_data(RAW_DATA_PATH),
+        "cleansed": load_data(MATCH_DATA_PATH),
+        "transformed": load_data(TRANSFORMED_DATA_PATH),
+    }
+    paths = {name: BENCHMARK_PATH.format(name=name) for name in seasons}
+    results = []
+
+    for scale in SCALES:
+        for name, season in seasons.items():
+            save_to_csv(pd.concat([season] * scale, ignore_index=True), paths[name])
+
+        for stage, (run_stage, source) in STAGES.items():
+            row = {"stage": stage, "rows": len(seasons[source]) * scale}
+            outputs = {}
+
+            for name in ENGINES:
+                start = time.perf_counter()
+                outputs[name] = run_stage(get_engine(name), paths, plan, analysis)
+                row[f"{name} (s)"] = time.perf_counter() - start
+
+            # every engine must produce the same table
+            first, *others = outputs.values()
+            row["identical"] = all(first.equals(other) for other in others)
+            results.append(row)
+
+    for path in paths.values():
+        os.remove(path)
+
+    print(pd.DataFrame(results).round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# get the absolute path of the project root (two levels up from current script)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../../"))
+
+# add project root to sys.path
+sys.path.append(PROJECT_ROOT)
+
+from utils.io import load_data
+from utils.shared import as_frame, release, share_frame, write_arrow
+
+
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+# define constants
+# transformed data and arrow ipc paths
+TRANSFORMED_DATA_PATH = "../../data/processed/transformed/matches-stadiums.csv"
+ARROW_DATA_PATH = "../../data/processed/matches-stadiums-benchmark.arrow"
+
+# columns the analysis stage needs
+COLUMNS = ["Home", "Away", "Country", "Travel Distance", "Home Points", "Away Points"]
+
+# how many times the season is repeated to grow the frame
+SCALES = [1, 100, 1000, 10000]
+REPEATS = 20
+
+
+def map_frame(source) -> int:
+    """map the frame inside a worker and return its length"""
+    return len(as_frame(source))
+
+
+def time_transfer(executor: ProcessPoolExecutor, source) -> float:
+    """return the mean round trip time, in milliseconds, of sending a source to a worker"""
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        executor.submit(map_frame, source).result()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main():
+    """compare pickled, shared memory and arrow hand-off as the frame grows"""
+    logging.info("starting shared memory benchmark")
+
+    season = load_data(TRANSFORMED_DATA_PATH)[COLUMNS]
+    results = []
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        # warm up the worker so process start-up is not measured
+        executor.submit(map_frame, season).result()
+
+        for scale in SCALES:
+            df = pd.concat([season] * scale, ignore_index=True)
+
+            handle, blocks = share_frame(df)
+            write_arrow(df, ARROW_DATA_PATH)
+            try:
+                results.append(
+                    {
+                        "rows": len(df),
+                        "pickled (ms)": time_transfer(executor, df),
+                        "shared memory (ms)": time_transfer(executor, handle),
+                        "arrow ipc (ms)": time_transfer(executor, ARROW_DATA_PATH),
+                    }
+                )
+            finally:
+                release(blocks, unlink=True)
+
+    os.remove(ARROW_DATA_PATH)
+    print(pd.DataFrame(results).round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
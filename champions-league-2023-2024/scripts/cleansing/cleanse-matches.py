@@ -1,3 +1,4 @@
+import argparse
 import pandas as pd
 import logging
 import sys
@@ -10,7 +11,16 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../../"))
 # add project root to sys.path
 sys.path.append(PROJECT_ROOT)
 
+from utils.engine import ENGINES, get_engine
 from utils.io import load_data, save_to_csv
+from utils.rules import (
+    apply_values,
+    compile_rules,
+    load_rules,
+    remap_values,
+    report_hits,
+    select_rows,
+)
 
 
 # configure logging
@@ -24,19 +34,7 @@ logging.basicConfig(
 # raw and cleansed data paths
 RAW_DATA_PATH = "../../data/raw/matches.csv"
 CLEANSED_DATA_PATH = "../../data/processed/cleansed/matches.csv"
-
-# list of unnecessary columns
-UNNECESSARY_COLUMNS = [
-    "Wk",
-    "Day",
-    "Date",
-    "Time",
-    "xG",
-    "xG.1",
-    "Referee",
-    "Match Report",
-    "Notes",
-]
+RULES_PATH = "../../config/cleansing/matches.json"
 
 # list of country codes
 COUNTRY_CODES = [
@@ -57,34 +55,6 @@ COUNTRY_CODES = [
     "ch",
 ]
 
-# dictionary with incorrect and correct stadiums names
-STADIUMS_TO_FIX = {
-    "Volksparkstadion (1953)": "Volksparkstadion",
-    "Stadium Metropolitano": "Estadio Cívitas Metropolitano",
-    "Trainingsgelände Allianz Arena": "Allianz Arena",
-    "Arsenal Stadium": "Emirates Stadium",
-    "Fælledparken Kunst": "Parken",
-    "Estádio Do Dragão": "Estádio do Dragão",
-}
-
-
-def drop_unnecessary_columns(df: pd.DataFrame, columns: list) -> pd.DataFrame:
-    """drop specified columns"""
-    logging.info("removing unnecessary columns")
-    return df.drop(columns=columns, axis=1)
-
-
-def drop_missing_values(df: pd.DataFrame) -> pd.DataFrame:
-    """drop empty rows"""
-    logging.info("removing empty rows")
-    return df.dropna().reset_index(drop=True)
-
-
-def filter_group_stage(df: pd.DataFrame) -> pd.DataFrame:
-    """filter the dataset to include only group stage fixtures"""
-    logging.info("filtering only group stage matches")
-    return df[df["Round"] == "Group stage"].drop(columns=["Round"], axis=1)
-
 
 def clean_club_names(df: pd.DataFrame, country_codes: list) -> pd.DataFrame:
     """clean club names by removing country codes"""
@@ -101,47 +71,29 @@ def clean_club_names(df: pd.DataFrame, country_codes: list) -> pd.DataFrame:
     return df
 
 
-def clean_attendance(df: pd.DataFrame) -> pd.DataFrame:
-    """remove commas from attendance and convert it into integers"""
-    logging.info("cleaning attendance column")
-    df["Attendance"] = df["Attendance"].str.replace(",", "").astype(int)
-    return df
-
-
-def fix_stadium_names(df: pd.DataFrame, stadiums_to_fix: dict) -> pd.DataFrame:
-    """replaces incorrect stadium names with correct ones"""
-    logging.info("fixing stadium names")
-    df["Venue"] = df["Venue"].replace(stadiums_to_fix)
-
-    df.loc[
-        (df["Home"] == "RB Salzburg") & (df["Venue"] == "Red Bull Arena"), "Venue"
-    ] = "Red Bull Arena (Salzburg)"
-    df.loc[
-        (df["Home"] == "RB Leipzig") & (df["Venue"] == "Red Bull Arena"), "Venue"
-    ] = "Red Bull Arena (Leipzig)"
-    df.loc[
-        (df["Home"] == "Milan") & (df["Venue"] == "Stadio Giuseppe Meazza"), "Venue"
-    ] = "Stadio San Siro"
-
-    logging.info("successfully fixed stadium names")
-    return df
-
-
 def main():
     """set up data cleansing process"""
+    parser = argparse.ArgumentParser(description="cleanse matches data")
+    parser.add_argument("--engine", choices=ENGINES, default="pandas")
+    args = parser.parse_args()
+
     logging.info("starting data cleaning process")
 
     try:
-        # load data
-        df = load_data(RAW_DATA_PATH)
+        # load data and rules
+        engine = get_engine(args.engine)
+        df = engine.load(RAW_DATA_PATH)
+        plan = compile_rules(load_rules(RULES_PATH))
+        hits = {}
+
+        # filter, drop and remap with the engine, club names are fixed in pandas
+        df = select_rows(engine, df, plan, hits)
+        df = engine.to_pandas(remap_values(engine, df, plan, hits))
 
         # apply transformations
-        df = drop_unnecessary_columns(df, UNNECESSARY_COLUMNS)
-        df = drop_missing_values(df)
-        df = filter_group_stage(df)
         df = clean_club_names(df, COUNTRY_CODES)
-        df = clean_attendance(df)
-        df = fix_stadium_names(df, STADIUMS_TO_FIX)
+        df = apply_values(df, plan, hits)
+        report_hits(hits)
 
         # save cleansed data
         save_to_csv(df, CLEANSED_DATA_PATH)
@@ -149,6 +101,10 @@ def main():
     except Exception as e:
         logging.error(f"data cleansing process failed: {e}")
 
+        # a caller that imported the stage, such as the watcher, needs the failure
+        if __name__ != "__main__":
+            raise
+
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,4 @@
+import argparse
 import pandas as pd
 import logging
 import re
@@ -11,7 +12,16 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../../"))
 # add project root to sys.path
 sys.path.append(PROJECT_ROOT)
 
+from utils.engine import ENGINES, get_engine
 from utils.io import load_data, save_to_csv
+from utils.rules import (
+    apply_values,
+    compile_rules,
+    load_rules,
+    remap_values,
+    report_hits,
+    select_rows,
+)
 
 
 # configure logging
@@ -25,38 +35,7 @@ logging.basicConfig(
 RAW_DATA_PATH = "../../data/raw/stadiums.csv"
 MATCH_DATA_PATH = "../../data/processed/cleansed/matches.csv"
 CLEANSED_DATA_PATH = "../../data/processed/cleansed/stadiums.csv"
-
-# dictionary with incorrect and correct stadiums names
-STADIUMS_TO_FIX = {
-    "Marakana": "Stadion Rajko Mitić",
-    "De Kuip": "Stadion Feijenoord",
-    "Estádio da Luz": "Estádio do Sport Lisboa e Benfica",
-    "Olímpic Lluís Companys": "Estadi Olímpic Lluís Companys",
-    "Cívitas Metropolitano": "Estadio Cívitas Metropolitano",
-    "Ramón Sánchez Pizjuán": "Estadio Ramón Sánchez Pizjuán",
-    "Santiago Bernabéu": "Estadio Santiago Bernabéu",
-    "Diego Maradona": "Stadio Diego Armando Maradona",
-    "Giuseppe Meazza": "Stadio Giuseppe Meazza",
-    "Olimpico": "Stadio Olimpico",
-}
-
-# dictionary with similar stadium names
-CITY_STADIUM_FIXES = {
-    "Wals-Siezenheim": "Red Bull Arena (Salzburg)",
-    "Leipzig": "Red Bull Arena (Leipzig)",
-}
-
-
-def preprocess_stadium_data(df: pd.DataFrame) -> pd.DataFrame:
-    """introduce minor changes"""
-    logging.info("preprocessing stadium data")
-    df.rename(columns={"stadium": "Venue"}, inplace=True)
-    df["Capacity"] = (df["Capacity"] * 1000).astype(int)
-
-    # remove the last row
-    df.drop(index=(len(df) - 1), inplace=True, axis=1)
-
-    return df
+RULES_PATH = "../../config/cleansing/stadiums.json"
 
 
 def get_unique_stadium_names(matches_df: pd.DataFrame) -> pd.DataFrame:
@@ -76,18 +55,6 @@ def fix_stadium_names(df: pd.DataFrame, stadiums: set) -> pd.DataFrame:
     return df
 
 
-def apply_manual_stadium_names(df: pd.DataFrame) -> pd.DataFrame:
-    """apply predefined manual fixes for stadium names."""
-    logging.info("applying manual stadium name fixes")
-
-    df["Venue"] = df["Venue"].replace(STADIUMS_TO_FIX)
-
-    for city, venue in CITY_STADIUM_FIXES.items():
-        df.loc[df["City"] == city, "Venue"] = venue
-
-    return df
-
-
 def add_new_stadium(df: pd.DataFrame) -> pd.DataFrame:
     """add 'San Siro' as Milan's home stadium"""
     logging.info("adding Milan's home stadium")
@@ -100,19 +67,30 @@ def add_new_stadium(df: pd.DataFrame) -> pd.DataFrame:
 
 def main():
     """set up data cleansing process"""
+    parser = argparse.ArgumentParser(description="cleanse stadiums data")
+    parser.add_argument("--engine", choices=ENGINES, default="pandas")
+    args = parser.parse_args()
+
     logging.info("starting data cleaning process")
 
     try:
-        # load data
-        df_stadiums = load_data(RAW_DATA_PATH)
+        # load data and rules
+        engine = get_engine(args.engine)
+        df_stadiums = engine.load(RAW_DATA_PATH)
         df_matches = load_data(MATCH_DATA_PATH)
+        plan = compile_rules(load_rules(RULES_PATH))
+        hits = {}
+
+        # filter, rename and remap with the engine, names are matched in pandas
+        df_stadiums = select_rows(engine, df_stadiums, plan, hits)
+        df_stadiums = engine.to_pandas(remap_values(engine, df_stadiums, plan, hits))
 
         # apply transformations
-        df_stadiums = preprocess_stadium_data(df_stadiums)
         unique_stadiums = get_unique_stadium_names(df_matches)
         df_stadiums = fix_stadium_names(df_stadiums, unique_stadiums)
-        df_stadiums = apply_manual_stadium_names(df_stadiums)
+        df_stadiums = apply_values(df_stadiums, plan, hits)
         df_stadiums = add_new_stadium(df_stadiums)
+        report_hits(hits)
 
         # save cleansed data
         save_to_csv(df_stadiums, CLEANSED_DATA_PATH)
@@ -120,6 +98,10 @@ def main():
     except Exception as e:
         logging.error(f"data cleansing process failed: {e}")
 
+        # a caller that imported the stage, such as the watcher, needs the failure
+        if __name__ != "__main__":
+            raise
+
 
 if __name__ == "__main__":
     main()
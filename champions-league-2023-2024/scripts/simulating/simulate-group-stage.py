@@ -0,0 +1,244 @@
+import argparse
+import logging
+import numpy as np
+import os
+import pandas as pd
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# get the absolute path of the project root (two levels up from current script)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../../"))
+
+# add project root to sys.path
+sys.path.append(PROJECT_ROOT)
+
+from utils.io import load_data, save_to_csv
+
+
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+# define constants
+# transformed and simulated data paths
+TRANSFORMED_DATA_PATH = "../../data/processed/transformed/matches-stadiums.csv"
+SIMULATED_DATA_PATH = "../../data/analysed/simulated-points.csv"
+
+# outcome order used by the model
+OUTCOMES = ["Home Win", "Draw", "Away Win"]
+AWAY_POINTS = np.array([0, 1, 3], dtype=np.float32)
+
+# simulation settings
+SEASONS = 1_000_000
+BATCH_SIZE = 20_000
+SEED = 2024
+
+# candidate distance effects, change in away win log-odds per 1000 km
+DISTANCE_EFFECT_GRID = np.linspace(-1.5, 1.5, 301)
+
+
+def outcome_probabilities(
+    distance: np.ndarray, base: np.ndarray, effect: float
+) -> np.ndarray:
+    """return home win, draw and away win probabilities for every match
+
+    the distance effect shifts the away win log-odds per 1000 km travelled
+    relative to the average trip, so effect=0 is the null model.
+    """
+    logits = np.tile(np.log(base), (len(distance), 1))
+    logits[:, 2] += effect * (distance - distance.mean()) / 1000
+
+    probabilities = np.exp(logits)
+    return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+
+def fit_distance_effect(
+    distance: np.ndarray, outcomes: np.ndarray, base: np.ndarray
+) -> float:
+    """pick the distance effect with the highest likelihood of the observed results"""
+    matches = np.arange(len(outcomes))
+    log_likelihoods = [
+        np.log(outcome_probabilities(distance, base, effect)[matches, outcomes]).sum()
+        for effect in DISTANCE_EFFECT_GRID
+    ]
+    return float(DISTANCE_EFFECT_GRID[np.argmax(log_likelihoods)])
+
+
+def build_model(df: pd.DataFrame) -> dict:
+    """build the per-match outcome model from the fixtures"""
+    outcomes = df["Result"].map({outcome: i for i, outcome in enumerate(OUTCOMES)})
+    outcomes = outcomes.to_numpy(dtype=int)
+    distance = df["Travel Distance"].to_numpy(dtype=float)
+
+    # observed outcome shares are the null model for every match
+    base = np.bincount(outcomes, minlength=len(OUTCOMES)) / len(outcomes)
+    effect = fit_distance_effect(distance, outcomes, base)
+
+    teams, team_codes = np.unique(df["Away"], return_inverse=True)
+    team_matrix = np.zeros((len(df), len(teams)), dtype=np.float32)
+    team_matrix[np.arange(len(df)), team_codes] = 1
+
+    # correlation of the observed season, the statistic the simulation is judged on
+    team_distance = distance @ team_matrix
+    team_points = df["Away Points"].to_numpy(dtype=float) @ team_matrix
+    observed_correlation = np.corrcoef(team_distance, team_points)[0, 1]
+
+    return {
+        "teams": teams,
+        "team_matrix": team_matrix,
+        "team_distance": team_distance,
+        "team_points": team_points,
+        "observed_correlation": observed_correlation,
+        "distance": distance,
+        "base": base,
+        "effect": effect,
+    }
+
+
+def simulate_seasons(task: tuple) -> dict:
+    """simulate one batch of seasons as arrays and return summed statistics"""
+    model, effect, seasons, seed_sequence = task
+    rng = np.random.default_rng(seed_sequence)
+
+    # cumulative probabilities turn one uniform draw into an outcome
+    cumulative = np.cumsum(
+        outcome_probabilities(model["distance"], model["base"], effect), axis=1
+    ).astype(np.float32)
+
+    draws = rng.random((seasons, len(cumulative)), dtype=np.float32)
+    outcomes = (draws > cumulative[:, 0]).astype(np.int8) + (draws > cumulative[:, 1])
+
+    # away points per team and season
+    points = AWAY_POINTS[outcomes] @ model["team_matrix"]
+
+    # pearson correlation of every season at once
+    team_distance = model["team_distance"] - model["team_distance"].mean()
+    centred = points - points.mean(axis=1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        correlation = (centred @ team_distance) / (
+            np.sqrt((centred**2).sum(axis=1)) * np.sqrt((team_distance**2).sum())
+        )
+    correlation = correlation[np.isfinite(correlation)]
+
+    return {
+        "seasons": seasons,
+        "points_sum": points.sum(axis=0, dtype=np.float64),
+        "points_squared_sum": (points.astype(np.float64) ** 2).sum(axis=0),
+        "valid_seasons": len(correlation),
+        "correlation_sum": correlation.sum(),
+        "at_or_below": int((correlation <= model["observed_correlation"]).sum()),
+    }
+
+
+def run_simulation(model: dict, effect: float, seasons: int, workers: int) -> dict:
+    """split the seasons into seeded batches and simulate them across processes
+
+    every batch gets its own generator from one seed sequence, so results do
+    not depend on the number of workers.
+    """
+    batches = [
+        min(BATCH_SIZE, seasons - start) for start in range(0, seasons, BATCH_SIZE)
+    ]
+    seed_sequences = np.random.SeedSequence(SEED).spawn(len(batches))
+    tasks = [(model, effect, batch, seq) for batch, seq in zip(batches, seed_sequences)]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(tasks) // workers)
+        results = list(executor.map(simulate_seasons, tasks, chunksize=chunksize))
+
+    total = {key: sum(result[key] for result in results) for key in results[0]}
+    mean = total["points_sum"] / total["seasons"]
+    variance = total["points_squared_sum"] / total["seasons"] - mean**2
+
+    return {
+        "mean": mean,
+        "std": np.sqrt(np.maximum(variance, 0)),
+        "mean_correlation": total["correlation_sum"] / total["valid_seasons"],
+        "share_at_or_below": total["at_or_below"] / total["valid_seasons"],
+    }
+
+
+def summarise(model: dict, null: dict, distance: dict) -> pd.DataFrame:
+    """compare expected away points per team under the null and distance models"""
+    summary_df = pd.DataFrame(
+        {
+            "Away": model["teams"],
+            "Travel Distance": model["team_distance"],
+            "Away Points": model["team_points"].astype(int),
+            "Null Expected Points": null["mean"],
+            "Null Std": null["std"],
+            "Distance Expected Points": distance["mean"],
+            "Distance Std": distance["std"],
+        }
+    )
+    summary_df["Distance Shift"] = (
+        summary_df["Distance Expected Points"] - summary_df["Null Expected Points"]
+    )
+
+    return (
+        summary_df.sort_values("Travel Distance", ascending=False)
+        .reset_index(drop=True)
+        .round(2)
+    )
+
+
+def positive_int(value: str) -> int:
+    """parse a command line count that must be at least one"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main():
+    """set up group stage simulation process"""
+    parser = argparse.ArgumentParser(description="simulate group stage away points")
+    parser.add_argument("--seasons", type=positive_int, default=SEASONS)
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count())
+    parser.add_argument(
+        "--distance-effect",
+        type=float,
+        help="away win log-odds change per 1000 km, fitted to the fixtures if omitted",
+    )
+    args = parser.parse_args()
+
+    logging.info("starting group stage simulation")
+
+    try:
+        # load data and build the outcome model
+        df = load_data(TRANSFORMED_DATA_PATH)
+        model = build_model(df)
+        effect = args.distance_effect
+        if effect is None:
+            effect = model["effect"]
+        logging.info(f"distance effect: {effect:+.2f} away win log-odds per 1000 km")
+
+        # simulate with and without the distance effect
+        null = run_simulation(model, 0.0, args.seasons, args.workers)
+        distance = run_simulation(model, effect, args.seasons, args.workers)
+
+        # compare with the observed season
+        logging.info(
+            f"observed correlation {model['observed_correlation']:.2f}, "
+            f"null mean {null['mean_correlation']:.2f}, "
+            f"distance model mean {distance['mean_correlation']:.2f}"
+        )
+        logging.info(
+            "share of seasons at or below the observed correlation: "
+            f"null {null['share_at_or_below']:.3f}, "
+            f"distance model {distance['share_at_or_below']:.3f}"
+        )
+
+        summary_df = summarise(model, null, distance)
+        save_to_csv(summary_df, SIMULATED_DATA_PATH)
+        logging.info("group stage simulation was successful!")
+    except Exception as e:
+        logging.error(f"group stage simulation failed: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+import argparse
 import logging
+import numpy as np
 import os
 import pandas as pd
 import re
@@ -13,7 +15,9 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../../"))
 # add project root to sys.path
 sys.path.append(PROJECT_ROOT)
 
-from utils.io import load_data, save_to_csv
+from utils.engine import ENGINES, get_engine
+from utils.io import save_to_csv
+from utils.shared import as_frame
 
 
 # configure logging
@@ -29,9 +33,10 @@ MATCH_DATA_PATH = "../../data/processed/cleansed/matches.csv"
 STADIUMS_DATA_PATH = "../../data/processed/cleansed/stadiums.csv"
 TRANSFORMED_DATA_PATH = "../../data/processed/transformed/matches-stadiums.csv"
 
-# initialize geolocator and cache
+# initialize geolocator and caches
 geolocator = Nominatim(user_agent="geo_distance_calculator", timeout=10)
 city_coords_cache = {}
+distance_cache = {}
 
 # compile the score pattern
 score_regex = re.compile(r"(\d+)\u2013(\d+)$")
@@ -66,15 +71,32 @@ def determine_result(score: str) -> str:
     return None
 
 
-def determine_distance(row: pd.Series, home_stadiums: dict) -> float:
-    """calculate the geodesic distance the home city and away city"""
-    home_city = row["City"]
-    home_coords = get_city_coords(home_city)
+def get_city_distance(home_city: str, away_city: str) -> float:
+    """return the geodesic distance between two cities, caching each pair"""
+    if (home_city, away_city) not in distance_cache:
+        home_coords = get_city_coords(home_city)
+        away_coords = get_city_coords(away_city)
+        distance_cache[(home_city, away_city)] = round(
+            (geodesic(home_coords, away_coords).kilometers), 2
+        )
+
+    return distance_cache[(home_city, away_city)]
 
-    away_city = home_stadiums[row["Away"]]
-    away_coords = get_city_coords(away_city)
 
-    return round((geodesic(home_coords, away_coords).kilometers), 2)
+def compute_distances(matches, home_stadiums: dict) -> np.ndarray:
+    """calculate the geodesic distance between the home city and away city of every match
+
+    matches may also be a shared memory handle or an arrow ipc path, so
+    worker processes can map the city and team columns without a copy.
+    """
+    matches = as_frame(matches)
+    return np.array(
+        [
+            get_city_distance(city, home_stadiums[away])
+            for city, away in zip(matches["City"], matches["Away"])
+        ],
+        dtype=float,
+    )
 
 
 def determine_points(result: str, team: str) -> int:
@@ -89,15 +111,22 @@ def determine_points(result: str, team: str) -> int:
 
 def main():
     """set up data transforming process"""
+    parser = argparse.ArgumentParser(description="transform matches and stadiums")
+    parser.add_argument("--engine", choices=ENGINES, default="pandas")
+    args = parser.parse_args()
+
     logging.info("starting data transforming process")
 
     try:
         # load data
-        matches = load_data(MATCH_DATA_PATH)
-        stadiums = load_data(STADIUMS_DATA_PATH)
+        engine = get_engine(args.engine)
+        matches = engine.load(MATCH_DATA_PATH)
+        stadiums = engine.load(STADIUMS_DATA_PATH)
 
-        # merge datasets on the venue
-        matches_stadiums = matches.merge(stadiums, how="inner", on="Venue")
+        # merge datasets on the venue, geocoding below runs row by row in pandas
+        matches_stadiums = engine.to_pandas(
+            engine.merge(matches, stadiums, on="Venue", how="inner")
+        )
 
         # compute match results
         matches_stadiums["Result"] = matches_stadiums["Score"].apply(determine_result)
@@ -111,8 +140,8 @@ def main():
         )
 
         # compute travel distance for each match
-        matches_stadiums["Travel Distance"] = matches_stadiums.apply(
-            lambda row: determine_distance(row, home_stadiums), axis=1
+        matches_stadiums["Travel Distance"] = compute_distances(
+            matches_stadiums, home_stadiums
         )
 
         # compute points for each team
@@ -129,6 +158,10 @@ def main():
     except Exception as e:
         logging.error(f"data transforming process failed: {e}")
 
+        # a caller that imported the stage, such as the watcher, needs the failure
+        if __name__ != "__main__":
+            raise
+
 
 if __name__ == "__main__":
     main()
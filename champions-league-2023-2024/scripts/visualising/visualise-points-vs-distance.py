@@ -1,8 +1,13 @@
+import argparse
 import logging
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
 # get the absolute path of the project root (two levels up from current script)
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -13,6 +18,7 @@ sys.path.append(PROJECT_ROOT)
 
 from adjustText import adjust_text
 from scipy.stats import pearsonr, spearmanr
+from utils.aggregate import add_away_country
 from utils.io import load_data
 
 
@@ -25,7 +31,24 @@ logging.basicConfig(
 
 # analysed data and visualed paths
 ANALYSED_DATA_PATH = "../../data/analysed/distance-points.csv"
+TRANSFORMED_DATA_PATH = "../../data/processed/transformed/matches-stadiums.csv"
 VISUALISED_PATH = "../../figures/points-vs-distance.png"
+BATCH_DIR = "../../figures/batch"
+
+# columns every batch figure is built from, so they cannot split the batch
+BATCH_FIGURE_COLUMNS = ["Away", "Travel Distance", "Away Points"]
+
+# tick spacing for distance and points axes
+DISTANCE_TICK_STEP = 500
+POINTS_TICK_STEP = 1
+
+# space between the outer ticks and the axis edges
+DISTANCE_PADDING = 200
+POINTS_PADDING = 0.5
+
+# resolution of full and preview figures
+FULL_DPI = 300
+PREVIEW_DPI = 72
 
 # team labels
 TEAM_LABELS = [
@@ -89,13 +112,18 @@ def add_trendline(x: np.ndarray, y: np.ndarray, ax: plt.Axes) -> None:
     ax.plot(x, trendline_y, color="#CC3311", linestyle="--", linewidth=0.7)
 
 
+def format_correlations(x: np.ndarray, y: np.ndarray) -> str:
+    """calculate Pearson and Spearman correlation coefficients as annotation text"""
+    pearson_corr, _ = pearsonr(x, y)
+    spearman_corr, _ = spearmanr(x, y)
+
+    return f"Pearson: {pearson_corr:.2f}\n" f"Spearman: {spearman_corr:.2f}"
+
+
 def calculate_correlations(x: np.ndarray, y: np.ndarray, ax: plt.Axes) -> None:
     """calculate and log Pearson and Spearman correlation coefficients"""
     try:
-        pearson_corr, _ = pearsonr(x, y)
-        spearman_corr, _ = spearmanr(x, y)
-
-        annotation = f"Pearson: {pearson_corr:.2f}\n" f"Spearman: {spearman_corr:.2f}"
+        annotation = format_correlations(x, y)
         ax.text(
             0.05,
             0.95,
@@ -109,30 +137,220 @@ def calculate_correlations(x: np.ndarray, y: np.ndarray, ax: plt.Axes) -> None:
         logging.error(f"error calculating correlations: {e}")
 
 
-def format_plot(ax: plt.Axes) -> None:
+def data_ticks(values: np.ndarray, step: float, start: float = None) -> np.ndarray:
+    """return evenly spaced ticks covering the range of the data"""
+    low = np.floor(np.min(values) / step) * step if start is None else start
+    high = np.ceil(np.max(values) / step) * step
+
+    # pad by a step so a single value still gets a range
+    if high <= low:
+        high = low + step
+
+    return np.arange(low, high + step, step)
+
+
+def set_data_ticks(x: np.ndarray, y: np.ndarray, ax: plt.Axes) -> None:
+    """set axis ticks and limits from the data range"""
+    x_ticks = data_ticks(x, DISTANCE_TICK_STEP)
+    ax.set_xticks(x_ticks)
+    ax.set_xlim(x_ticks[0] - DISTANCE_PADDING, x_ticks[-1] + DISTANCE_PADDING)
+
+    # leave one step of headroom above the best points total
+    y_ticks = data_ticks(y + POINTS_TICK_STEP, POINTS_TICK_STEP, start=0)
+    ax.set_yticks(y_ticks)
+
+    # explicit limits, a reused template would otherwise keep an earlier range
+    ax.set_ylim(y_ticks[0] - POINTS_PADDING, y_ticks[-1] + POINTS_PADDING)
+
+
+def format_plot(x: np.ndarray, y: np.ndarray, ax: plt.Axes) -> None:
     """format the plot with ticks, labels, and grid settings"""
-    ax.set_xticks(np.arange(1500, 7000, 500))
-    ax.set_yticks(np.arange(0, 11, 1))
+    set_data_ticks(x, y, ax)
 
     ax.set_ylabel("number of points", fontsize=12, fontweight="bold")
     ax.set_xlabel("distance travelled (km)", fontsize=12, fontweight="bold")
     ax.set_title("away points to distance correlation", fontsize=14, fontweight="bold")
 
-    ax.set_xlim(min(ax.get_xticks()) - 200, max(ax.get_xticks()) + 200)
     ax.grid(linestyle="--", linewidth=0.3, alpha=0.8)
 
 
-def save_figure(fig: plt.Figure, filepath: str) -> None:
+def save_figure(fig: plt.Figure, filepath: str, dpi: int = FULL_DPI) -> None:
     """save the figure as png"""
     try:
-        fig.savefig(filepath, dpi=300)
+        fig.savefig(filepath, dpi=dpi)
         logging.info("successfully saved figure")
     except Exception as e:
         logging.error(f"error saving figure: {e}")
 
 
+# figure template reused by every render in a worker process
+figure_template = None
+
+
+def create_figure_template() -> dict:
+    """build an agg figure once so renders only update artist data"""
+    fig = Figure(figsize=(8, 8))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    scatter = ax.scatter(
+        [], [], color="#0077BB", alpha=0.7, edgecolors="black", linewidth=0.5
+    )
+    (trendline,) = ax.plot([], [], color="#CC3311", linestyle="--", linewidth=0.7)
+    annotation = ax.text(
+        0.05,
+        0.95,
+        "",
+        transform=ax.transAxes,
+        fontsize=10,
+        verticalalignment="top",
+        bbox=dict(boxstyle="round", facecolor="#CC3311", alpha=0.2),
+    )
+
+    ax.set_ylabel("number of points", fontsize=12, fontweight="bold")
+    ax.set_xlabel("distance travelled (km)", fontsize=12, fontweight="bold")
+    ax.grid(linestyle="--", linewidth=0.3, alpha=0.8)
+
+    return {
+        "fig": fig,
+        "ax": ax,
+        "scatter": scatter,
+        "trendline": trendline,
+        "annotation": annotation,
+        "labels": [],
+    }
+
+
+def init_render_worker() -> None:
+    """create the figure template once per worker process"""
+    global figure_template
+    figure_template = create_figure_template()
+
+
+def render_figure(task: dict) -> str:
+    """render one figure by updating the template artists and save it"""
+    if figure_template is None:
+        init_render_worker()
+
+    template = figure_template
+    ax = template["ax"]
+    x, y = task["x"], task["y"]
+
+    template["scatter"].set_offsets(np.column_stack([x, y]))
+
+    # a trendline and correlations need at least two distinct distances
+    if len(np.unique(x)) > 1:
+        m, b = np.polyfit(x, y, 1)
+        line_x = np.sort(x)
+        template["trendline"].set_data(line_x, m * line_x + b)
+    else:
+        template["trendline"].set_data([], [])
+
+    try:
+        template["annotation"].set_text(format_correlations(x, y))
+    except Exception:
+        template["annotation"].set_text("Pearson: n/a\nSpearman: n/a")
+
+    # limits must be final before labels are placed against them
+    set_data_ticks(x, y, ax)
+    ax.set_title(task["title"], fontsize=14, fontweight="bold")
+
+    for text in template["labels"]:
+        text.remove()
+    template["labels"] = [
+        ax.text(x[i], y[i], label, fontsize=10) for i, label in enumerate(task["labels"])
+    ]
+
+    # label placement dominates render time, so previews skip it
+    if not task["preview"]:
+        adjust_text(
+            template["labels"],
+            ax=ax,
+            force_text=0.3,
+            force_points=0.3,
+            expand_text=(1.2, 1.5),
+            expand_points=(1.3, 1.5),
+        )
+
+    save_figure(
+        template["fig"], task["path"], dpi=PREVIEW_DPI if task["preview"] else FULL_DPI
+    )
+    return task["path"]
+
+
+def build_batch_tasks(df, group_by: str, team_labels: dict, preview: bool) -> list:
+    """aggregate away points and distance per group in one pass and build render tasks"""
+    grouped = (
+        df.groupby([group_by, "Away"])[["Travel Distance", "Away Points"]]
+        .sum()
+        .reset_index()
+    )
+
+    tasks = []
+    for group, group_df in grouped.groupby(group_by, sort=True):
+        slug = re.sub(r"[^a-z0-9]+", "-", str(group).lower()).strip("-")
+        tasks.append(
+            {
+                "title": f"away points to distance correlation ({group})",
+                "x": group_df["Travel Distance"].to_numpy(),
+                "y": group_df["Away Points"].to_numpy(),
+                "labels": [team_labels.get(team, team) for team in group_df["Away"]],
+                "path": os.path.join(
+                    BATCH_DIR, f"{group_by.lower().replace(' ', '-')}-{slug}.png"
+                ),
+                "preview": preview,
+            }
+        )
+
+    return tasks
+
+
+def render_batch(group_by: str, preview: bool, workers: int = None) -> None:
+    """render one figure per group across a pool of agg workers"""
+    logging.info(f"starting batch visualisation by {group_by}")
+
+    df = add_away_country(load_data(TRANSFORMED_DATA_PATH))
+    if group_by not in df.columns:
+        logging.error(f"unknown batch column: {group_by}")
+        return
+    if group_by in BATCH_FIGURE_COLUMNS:
+        logging.error(f"cannot batch by {group_by}, every figure plots it")
+        return
+
+    # reuse the short team labels of the season figure
+    analysed = load_data(ANALYSED_DATA_PATH)
+    team_labels = dict(zip(analysed["Away"], TEAM_LABELS))
+
+    tasks = build_batch_tasks(df, group_by, team_labels, preview)
+    os.makedirs(BATCH_DIR, exist_ok=True)
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=init_render_worker
+    ) as executor:
+        paths = list(executor.map(render_figure, tasks))
+
+    logging.info(f"rendered {len(paths)} figures")
+
+
 def main():
     """set up visualisation process"""
+    parser = argparse.ArgumentParser(description="visualise away points vs distance")
+    parser.add_argument(
+        "--batch-by",
+        help="render one figure per value of this column, e.g. 'Away Country'",
+    )
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="render low-dpi previews without label placement",
+    )
+    parser.add_argument("--workers", type=int, help="number of render processes")
+    args = parser.parse_args()
+
+    if args.batch_by:
+        render_batch(args.batch_by, args.preview, args.workers)
+        return
+
     logging.info("starting visualisation process")
 
     # load data
@@ -152,10 +370,11 @@ def main():
     create_scatter_plot(x, y, TEAM_LABELS, ax)
     add_trendline(x, y, ax)
     calculate_correlations(x, y, ax)
-    format_plot(ax)
+    format_plot(x, y, ax)
 
     # save visualisation
     save_figure(fig, VISUALISED_PATH)
+    plt.close(fig)
     logging.info("visualisation was successful!")
 
 
@@ -0,0 +1,257 @@
+import argparse
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import sys
+import time
+
+import matplotlib
+
+# render without a display, the watcher only writes files
+matplotlib.use("Agg")
+
+# get the absolute path of the project root (two levels up from current script)
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../../"))
+
+# add project root to sys.path
+sys.path.append(PROJECT_ROOT)
+
+
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+# define constants
+# seconds between checks for changed files
+POLL_INTERVAL = 0.2
+
+# shared helper modules imported by the stage scripts
+UTILS_DIR = "utils"
+UTILS_IMPORT_REGEX = re.compile(r"\butils\.(\w+)")
+
+# module attributes kept across reloads of a stage script
+CACHED_ATTRIBUTES = ["city_coords_cache", "distance_cache"]
+
+# pipeline stages in run order, paths relative to the project root
+STAGES = [
+    {
+        "name": "cleanse matches",
+        "script": "scripts/cleansing/cleanse-matches.py",
+        "inputs": ["data/raw/matches.csv", "config/cleansing/matches.json"],
+        "outputs": ["data/processed/cleansed/matches.csv"],
+    },
+    {
+        "name": "cleanse stadiums",
+        "script": "scripts/cleansing/cleanse-stadiums.py",
+        "inputs": [
+            "data/raw/stadiums.csv",
+            "data/processed/cleansed/matches.csv",
+            "config/cleansing/stadiums.json",
+        ],
+        "outputs": ["data/processed/cleansed/stadiums.csv"],
+    },
+    {
+        "name": "transform",
+        "script": "scripts/transforming/transform-matches-stadiums.py",
+        "inputs": [
+            "data/processed/cleansed/matches.csv",
+            "data/processed/cleansed/stadiums.csv",
+        ],
+        "outputs": ["data/processed/transformed/matches-stadiums.csv"],
+    },
+    {
+        "name": "analyse",
+        "script": "scripts/analysing/analyse-team-performance.py",
+        "inputs": ["data/processed/transformed/matches-stadiums.csv"],
+        "outputs": ["data/analysed/distance-points.csv"],
+    },
+    {
+        "name": "visualise",
+        "script": "scripts/visualising/visualise-points-vs-distance.py",
+        "inputs": ["data/analysed/distance-points.csv"],
+        "outputs": ["figures/points-vs-distance.png"],
+    },
+]
+
+
+def project_path(path: str) -> str:
+    """return the absolute path of a project file"""
+    return os.path.join(PROJECT_ROOT, path)
+
+
+def file_hash(path: str) -> str:
+    """return the sha256 of a file, or None if it does not exist"""
+    try:
+        with open(project_path(path), "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def file_mtime(path: str) -> float:
+    """return the modification time of a file, or None if it does not exist"""
+    try:
+        return os.stat(project_path(path)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def utils_files() -> list:
+    """return the helper modules under utils, relative to the project root"""
+    return sorted(
+        f"{UTILS_DIR}/{name}"
+        for name in os.listdir(project_path(UTILS_DIR))
+        if name.endswith(".py")
+    )
+
+
+def utils_dependencies(path: str) -> set:
+    """return every helper module a file imports, directly or through other helpers"""
+    known = set(utils_files())
+    found = set()
+    pending = [path]
+
+    while pending:
+        with open(project_path(pending.pop()), encoding="utf-8") as f:
+            names = UTILS_IMPORT_REGEX.findall(f.read())
+
+        # engines are named in strings and imported lazily, the regex sees both
+        for name in names:
+            module_path = f"{UTILS_DIR}/{name}.py"
+            if module_path in known and module_path not in found:
+                found.add(module_path)
+                pending.append(module_path)
+
+    return found
+
+
+def watched_files() -> list:
+    """return the stage scripts, the helper modules and every input no stage writes"""
+    outputs = {output for stage in STAGES for output in stage["outputs"]}
+    files = [stage["script"] for stage in STAGES] + utils_files()
+    files += [i for stage in STAGES for i in stage["inputs"] if i not in outputs]
+    return sorted(set(files))
+
+
+def forget_utils_modules() -> None:
+    """drop imported helper modules so reloaded stages import the edited versions"""
+    for name in list(sys.modules):
+        if name.startswith(f"{UTILS_DIR}."):
+            del sys.modules[name]
+
+
+def load_stage(stage: dict, previous=None):
+    """import a stage script as a module, carrying caches over from a previous load"""
+    name = os.path.splitext(os.path.basename(stage["script"]))[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, project_path(stage["script"]))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    if previous is not None:
+        for attribute in CACHED_ATTRIBUTES:
+            if hasattr(previous, attribute):
+                setattr(module, attribute, getattr(previous, attribute))
+
+    return module
+
+
+def run_stage(stage: dict, module) -> bool:
+    """run a stage's main as if its script were started from its own folder
+
+    imported stages re-raise their failures, so False means the stage failed.
+    """
+    # stage paths are relative to their script folder and main parses sys.argv
+    os.chdir(os.path.dirname(project_path(stage["script"])))
+    sys.argv = [stage["script"]]
+
+    # a failing stage must not stop the watcher
+    try:
+        module.main()
+    except (Exception, SystemExit) as e:
+        logging.error(f"{stage['name']} failed: {e!r}")
+        return False
+
+    return True
+
+
+def run_pipeline(modules: dict, changed: set, force: bool = False) -> list:
+    """re-run only the stages downstream of changed files, in order"""
+    if any(path.startswith(f"{UTILS_DIR}/") for path in changed):
+        forget_utils_modules()
+
+    ran = []
+    for stage in STAGES:
+        dependencies = {stage["script"]} | utils_dependencies(stage["script"])
+        if changed.intersection(dependencies):
+            logging.info(f"reloading {stage['name']}")
+            try:
+                modules[stage["name"]] = load_stage(stage, modules[stage["name"]])
+            except Exception as e:
+                logging.error(f"could not reload {stage['name']}: {e!r}")
+                continue
+        elif not force and not changed.intersection(stage["inputs"]):
+            continue
+
+        before = {output: file_hash(output) for output in stage["outputs"]}
+        if not run_stage(stage, modules[stage["name"]]):
+            continue
+        ran.append(stage["name"])
+
+        # stages downstream only run if this stage's outputs really changed
+        for output in stage["outputs"]:
+            if file_hash(output) != before[output]:
+                changed.add(output)
+
+    return ran
+
+
+def main():
+    """keep the pipeline loaded and re-run affected stages when files change"""
+    parser = argparse.ArgumentParser(description="watch raw data and rules")
+    parser.add_argument(
+        "--skip-initial-run",
+        action="store_true",
+        help="do not run the whole pipeline once before watching",
+    )
+    args = parser.parse_args()
+
+    logging.info("loading pipeline stages")
+    modules = {stage["name"]: load_stage(stage) for stage in STAGES}
+
+    # one full run fills the geocode and distance caches
+    if not args.skip_initial_run:
+        run_pipeline(modules, set(), force=True)
+
+    files = watched_files()
+    mtimes = {path: file_mtime(path) for path in files}
+    logging.info(f"watching {len(files)} files, press ctrl+c to stop")
+
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+
+            changed = {path for path in files if file_mtime(path) != mtimes[path]}
+            if not changed:
+                continue
+
+            for path in changed:
+                mtimes[path] = file_mtime(path)
+
+            start = time.perf_counter()
+            ran = run_pipeline(modules, changed)
+            logging.info(
+                f"re-ran {', '.join(ran) or 'nothing'} "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+    except KeyboardInterrupt:
+        logging.info("stopped watching")
+
+
+if __name__ == "__main__":
+    main()
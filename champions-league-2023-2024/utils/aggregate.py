@@ -0,0 +1,146 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+# above this many possible key combinations, group ids are compacted by sorting
+MAX_DENSE_GROUPS = 10_000_000
+
+
+def add_away_country(df: pd.DataFrame) -> pd.DataFrame:
+    """add the away team's country, taken from the venues where it plays at home"""
+    home_countries = (
+        df[["Home", "Country"]].drop_duplicates().set_index("Home")["Country"]
+    )
+    df["Away Country"] = df["Away"].map(home_countries)
+    return df
+
+
+def add_distance_band(df: pd.DataFrame, bands: list) -> pd.DataFrame:
+    """bucket each match's travel distance into the given km bands"""
+    labels = [f"{low}-{high} km" for low, high in zip(bands, bands[1:])]
+    labels.append(f"{bands[-1]}+ km")
+
+    df["Distance Band"] = pd.cut(
+        df["Travel Distance"], bins=bands + [np.inf], labels=labels, right=False
+    )
+    return df
+
+
+def _factorise_keys(df: pd.DataFrame, by: tuple, key_codes: dict) -> tuple:
+    """combine the integer codes of several key columns into one dense group id"""
+    codes = [key_codes[key][0] for key in by]
+    sizes = [len(key_codes[key][1]) for key in by]
+
+    # rows with a missing key are left out of the view
+    valid = np.ones(len(df), dtype=bool)
+    for code in codes:
+        valid &= code >= 0
+
+    group_ids = np.zeros(len(df), dtype=np.int64)
+    for code, size in zip(codes, sizes):
+        group_ids = group_ids * size + code
+    group_ids = group_ids[valid]
+
+    # sparse key combinations are compacted, keeping the mixed radix ids for labels
+    n_groups = int(np.prod(sizes, dtype=np.int64))
+    radix_ids = None
+    if n_groups > MAX_DENSE_GROUPS:
+        radix_ids, group_ids = np.unique(group_ids, return_inverse=True)
+        n_groups = len(radix_ids)
+
+    return group_ids, valid, n_groups, radix_ids
+
+
+def _group_labels(by: tuple, key_codes: dict, group_ids: np.ndarray) -> dict:
+    """turn mixed radix group ids back into one label column per key"""
+    labels = {}
+    for key in reversed(by):
+        uniques = key_codes[key][1]
+        labels[key] = np.asarray(uniques)[group_ids % len(uniques)]
+        group_ids = group_ids // len(uniques)
+    return {key: labels[key] for key in by}
+
+
+def aggregate_views(df: pd.DataFrame, views: list, decimals: int = 2) -> dict:
+    """compute every view in one scan using factorised keys and bincount reductions
+
+    each view is a dict with a "name", the "by" columns to group on and
+    "metrics" mapping an output column to ("sum" | "mean", column),
+    ("count",) or ("per_1000", numerator, denominator).
+    """
+    try:
+        logging.info(f"aggregating {len(views)} views")
+
+        # factorise every key column once, shared by all views that use it
+        key_codes = {}
+        for view in views:
+            for key in view["by"]:
+                if key not in key_codes:
+                    key_codes[key] = pd.factorize(df[key], sort=True)
+
+        # each group layout and column total is reduced only once
+        layouts = {}
+        totals = {}
+
+        def column_total(by: tuple, column: str) -> np.ndarray:
+            if (by, column) not in totals:
+                group_ids, valid, n_groups, _ = layouts[by]
+                weights = None
+                if column is not None:
+                    weights = df[column].to_numpy(dtype=float)[valid]
+                totals[(by, column)] = np.bincount(
+                    group_ids, weights=weights, minlength=n_groups
+                )
+            return totals[(by, column)]
+
+        results = {}
+        for view in views:
+            by = tuple(view["by"])
+            if by not in layouts:
+                layouts[by] = _factorise_keys(df, by, key_codes)
+
+            counts = column_total(by, None)
+            observed = np.flatnonzero(counts)
+
+            radix_ids = layouts[by][3]
+            columns = _group_labels(
+                by, key_codes, observed if radix_ids is None else radix_ids[observed]
+            )
+            for output, (func, *args) in view["metrics"].items():
+                if func == "sum":
+                    values = column_total(by, args[0])
+                    if pd.api.types.is_integer_dtype(df[args[0]]):
+                        values = values.round().astype(int)
+                elif func == "mean":
+                    values = column_total(by, args[0]) / np.maximum(counts, 1)
+                elif func == "count":
+                    values = counts.astype(int)
+                elif func == "per_1000":
+                    denominator = column_total(by, args[1])
+                    values = np.divide(
+                        column_total(by, args[0]) * 1000,
+                        denominator,
+                        out=np.full(len(denominator), np.nan),
+                        where=denominator != 0,
+                    )
+                else:
+                    raise ValueError(f"unknown aggregation: {func}")
+
+                columns[output] = values[observed]
+
+            result_df = pd.DataFrame(columns)
+            results[view["name"]] = result_df.round(decimals)
+
+        return results
+    except Exception as e:
+        logging.error(f"error aggregating views: {e}")
+        raise
@@ -0,0 +1,124 @@
+import csv
+import gzip
+import hashlib
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable
+from urllib.parse import urlparse
+
+import pandas as pd
+
+
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+# index file columns
+INDEX_COLUMNS = ["url", "fetched_at", "sha256"]
+
+
+def _object_path(archive_dir: str, digest: str) -> str:
+    """return the path of a compressed page inside the archive"""
+    return os.path.join(archive_dir, "objects", digest[:2], f"{digest[2:]}.html.gz")
+
+
+def _index_path(archive_dir: str) -> str:
+    """return the path of the archive index"""
+    return os.path.join(archive_dir, "index.csv")
+
+
+def url_slug(url: str) -> str:
+    """turn a url into a file name that is safe on every platform"""
+    parsed = urlparse(url)
+    return re.sub(r"[^a-z0-9]+", "-", f"{parsed.path}{parsed.query}".lower()).strip("-")
+
+
+def store_page(archive_dir: str, url: str, content: bytes) -> str:
+    """store a fetched page compressed under its sha256 and record it in the index"""
+    try:
+        digest = hashlib.sha256(content).hexdigest()
+        object_path = _object_path(archive_dir, digest)
+
+        # identical pages are stored only once
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            with gzip.open(object_path, "wb") as f:
+                f.write(content)
+
+        index_path = _index_path(archive_dir)
+        new_index = not os.path.exists(index_path)
+        with open(index_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if new_index:
+                writer.writerow(INDEX_COLUMNS)
+            writer.writerow(
+                [url, datetime.now(timezone.utc).isoformat(timespec="seconds"), digest]
+            )
+
+        logging.info(f"archived page {digest[:12]} for {url}")
+        return digest
+    except Exception as e:
+        logging.error(f"error archiving page: {e}")
+        raise
+
+
+def load_page(archive_dir: str, digest: str) -> bytes:
+    """load a page from the archive by its sha256"""
+    with gzip.open(_object_path(archive_dir, digest), "rb") as f:
+        return f.read()
+
+
+def load_index(archive_dir: str) -> pd.DataFrame:
+    """load the archive index, one row per fetch"""
+    index_path = _index_path(archive_dir)
+    if not os.path.exists(index_path):
+        return pd.DataFrame(columns=INDEX_COLUMNS)
+    return pd.read_csv(index_path)
+
+
+def latest_pages(archive_dir: str, urls: list = None) -> pd.DataFrame:
+    """return the most recent fetch of every archived url, optionally restricted to urls"""
+    index = load_index(archive_dir)
+    if urls is not None:
+        index = index[index["url"].isin(urls)]
+
+    # iso timestamps sort lexicographically, ties keep their index order
+    return (
+        index.sort_values("fetched_at", kind="stable")
+        .drop_duplicates(subset="url", keep="last")
+        .reset_index(drop=True)
+    )
+
+
+def _parse_archived(args: tuple) -> pd.DataFrame:
+    """load and parse a single archived page inside a worker"""
+    parse_fn, archive_dir, digest = args
+    return parse_fn(load_page(archive_dir, digest))
+
+
+def replay(
+    archive_dir: str, parse_fn: Callable, urls: list = None, workers: int = None
+) -> dict:
+    """re-parse the latest archived page of each url in parallel, without network access"""
+    pages = latest_pages(archive_dir, urls)
+    if pages.empty:
+        logging.error("no archived pages found to replay")
+        return {}
+
+    logging.info(f"replaying {len(pages)} archived pages")
+    tasks = [(parse_fn, archive_dir, digest) for digest in pages["sha256"]]
+
+    # a single page is not worth the cost of starting a pool
+    if len(tasks) == 1:
+        results = [_parse_archived(tasks[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_parse_archived, tasks))
+
+    return dict(zip(pages["url"], results))
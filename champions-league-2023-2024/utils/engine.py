@@ -0,0 +1,26 @@
+import importlib
+import logging
+
+# engine names and the modules implementing them
+ENGINES = {
+    "pandas": "utils.engine_pandas",
+    "polars": "utils.engine_polars",
+}
+
+
+def get_engine(name: str):
+    """return the module implementing the pipeline operations for an engine
+
+    every engine module provides load, columns, select, rename,
+    filter_rows, value_counts, remap, merge, group_sum, sort, materialise
+    and to_pandas with the same arguments and results, so stages can switch
+    engines per run.
+    """
+    if name not in ENGINES:
+        raise ValueError(f"unknown engine: {name}")
+
+    try:
+        return importlib.import_module(ENGINES[name])
+    except ImportError as e:
+        logging.error(f"engine '{name}' is not available: {e}")
+        raise
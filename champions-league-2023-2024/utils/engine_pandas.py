@@ -0,0 +1,102 @@
+import pandas as pd
+
+from utils.io import load_data
+
+
+def load(path: str) -> pd.DataFrame:
+    """load a csv file eagerly"""
+    return load_data(path)
+
+
+def columns(df: pd.DataFrame) -> list:
+    """return the column names in order"""
+    return list(df.columns)
+
+
+def select(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """keep only the given columns"""
+    return df[columns]
+
+
+def rename(df: pd.DataFrame, mapping: dict) -> pd.DataFrame:
+    """rename columns, leaving the others as they are"""
+    return df.rename(columns=mapping)
+
+
+def _keep_mask(df: pd.DataFrame, rule: dict) -> pd.Series:
+    """return the rows a single filter rule keeps"""
+    kind = rule["type"]
+    if kind == "not_null":
+        return df[rule["columns"]].notna().all(axis=1)
+    if kind == "equals":
+        return df[rule["column"]] == rule["value"]
+    if kind == "not_equals":
+        return df[rule["column"]] != rule["value"]
+    if kind == "in":
+        return df[rule["column"]].isin(rule["values"])
+    if kind == "not_in":
+        return ~df[rule["column"]].isin(rule["values"])
+
+    raise ValueError(f"unknown filter type: {kind}")
+
+
+def filter_rows(df: pd.DataFrame, rules: list) -> tuple:
+    """keep the rows every rule keeps, returning the rows each rule drops"""
+    mask = pd.Series(True, index=df.index)
+    dropped = []
+    for rule in rules:
+        keep = _keep_mask(df, rule)
+        dropped.append(int((~keep).sum()))
+        mask &= keep
+
+    return df[mask].reset_index(drop=True), dropped
+
+
+def value_counts(df: pd.DataFrame, column: str) -> pd.Series:
+    """count the rows of each non-missing value of a column"""
+    return df[column].value_counts()
+
+
+def remap(
+    df: pd.DataFrame, column: str, mapping: dict, output: str = None
+) -> pd.DataFrame:
+    """map the values of a column, writing to output if given"""
+    df = df.copy()
+    df[output or column] = df[column].map(mapping).fillna(df[column])
+    return df
+
+
+def merge(
+    left: pd.DataFrame, right: pd.DataFrame, on: str, how: str = "inner"
+) -> pd.DataFrame:
+    """join two frames, keeping the order of the left frame"""
+    return left.merge(right, how=how, on=on)
+
+
+def group_sum(
+    df: pd.DataFrame, by: list, columns: list, decimals: int = 2
+) -> pd.DataFrame:
+    """sum columns per group, ordered by the group keys"""
+    return (
+        df.groupby(by, sort=True, observed=True)[columns]
+        .sum()
+        .reset_index()
+        .round(decimals)
+    )
+
+
+def sort(df: pd.DataFrame, column: str, descending: bool = False) -> pd.DataFrame:
+    """order rows by a column, keeping ties in their current order"""
+    return df.sort_values(column, ascending=not descending, kind="stable").reset_index(
+        drop=True
+    )
+
+
+def materialise(df: pd.DataFrame) -> pd.DataFrame:
+    """return the frame, pandas frames are already in memory"""
+    return df
+
+
+def to_pandas(df: pd.DataFrame) -> pd.DataFrame:
+    """return the frame as pandas"""
+    return df
@@ -0,0 +1,130 @@
+import csv
+
+import pandas as pd
+import polars as pl
+
+
+def _pandas_column_names(path: str) -> list:
+    """read the csv header and name repeated columns like pandas does (xG, xG.1)"""
+    with open(path, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f))
+
+    names = []
+    seen = {}
+    for name in header:
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+
+    return names
+
+
+def load(path: str) -> pl.LazyFrame:
+    """scan a csv file lazily, nothing is read until the plan is collected"""
+    return pl.scan_csv(path, new_columns=_pandas_column_names(path))
+
+
+def columns(df: pl.LazyFrame) -> list:
+    """return the column names in order"""
+    return df.collect_schema().names()
+
+
+def select(df: pl.LazyFrame, columns: list) -> pl.LazyFrame:
+    """keep only the given columns"""
+    return df.select(columns)
+
+
+def rename(df: pl.LazyFrame, mapping: dict) -> pl.LazyFrame:
+    """rename columns, leaving the others as they are"""
+    names = set(columns(df))
+    return df.rename({old: new for old, new in mapping.items() if old in names})
+
+
+def _keep_expression(rule: dict) -> pl.Expr:
+    """return an expression for the rows a single filter rule keeps
+
+    missing values are kept or dropped exactly as the pandas engine does.
+    """
+    kind = rule["type"]
+    if kind == "not_null":
+        return pl.all_horizontal([pl.col(c).is_not_null() for c in rule["columns"]])
+    if kind == "equals":
+        return (pl.col(rule["column"]) == rule["value"]).fill_null(False)
+    if kind == "not_equals":
+        return (pl.col(rule["column"]) != rule["value"]).fill_null(True)
+    if kind == "in":
+        return pl.col(rule["column"]).is_in(rule["values"]).fill_null(False)
+    if kind == "not_in":
+        return ~pl.col(rule["column"]).is_in(rule["values"]).fill_null(False)
+
+    raise ValueError(f"unknown filter type: {kind}")
+
+
+def filter_rows(df: pl.LazyFrame, rules: list) -> tuple:
+    """keep the rows every rule keeps, returning the rows each rule drops
+
+    counting needs the data, so the plan is collected once here and the
+    filtered frame continues lazily from memory.
+    """
+    if not rules:
+        return df, []
+
+    flags = [f"__keep_{i}" for i in range(len(rules))]
+    flagged = df.with_columns(
+        [_keep_expression(rule).alias(flag) for rule, flag in zip(rules, flags)]
+    ).collect()
+
+    dropped = [int((~flagged[flag]).sum()) for flag in flags]
+    kept = flagged.filter(pl.all_horizontal(flags)).drop(flags)
+    return kept.lazy(), dropped
+
+
+def value_counts(df: pl.LazyFrame, column: str) -> pd.Series:
+    """count the rows of each non-missing value of a column"""
+    counts = df.group_by(column).len().drop_nulls().collect()
+    return pd.Series(counts["len"].to_list(), index=counts[column].to_list())
+
+
+def remap(
+    df: pl.LazyFrame, column: str, mapping: dict, output: str = None
+) -> pl.LazyFrame:
+    """map the values of a column, writing to output if given"""
+    return df.with_columns(pl.col(column).replace(mapping).alias(output or column))
+
+
+def merge(
+    left: pl.LazyFrame, right: pl.LazyFrame, on: str, how: str = "inner"
+) -> pl.LazyFrame:
+    """join two frames, keeping the order of the left frame"""
+    return left.join(right, on=on, how=how, maintain_order="left")
+
+
+def group_sum(
+    df: pl.LazyFrame, by: list, columns: list, decimals: int = 2
+) -> pl.LazyFrame:
+    """sum columns per group, ordered by the group keys"""
+    sums = []
+    for column in columns:
+        total = pl.col(column).sum()
+        if df.collect_schema()[column].is_float():
+            total = total.round(decimals)
+        sums.append(total)
+    return df.group_by(by).agg(sums).sort(by)
+
+
+def sort(df: pl.LazyFrame, column: str, descending: bool = False) -> pl.LazyFrame:
+    """order rows by a column, keeping ties in their current order"""
+    return df.sort(column, descending=descending, maintain_order=True)
+
+
+def materialise(df: pl.LazyFrame) -> pl.LazyFrame:
+    """read the plan into memory once, so several results reuse it lazily"""
+    return df.collect().lazy()
+
+
+def to_pandas(df: pl.LazyFrame) -> pd.DataFrame:
+    """run the plan and return the result as pandas"""
+    return df.collect().to_pandas()
@@ -0,0 +1,184 @@
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+def load_rules(path: str) -> dict:
+    """load cleansing rules from a json file"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            rules = json.load(f)
+        logging.info("successfully loaded cleansing rules")
+        return rules
+    except Exception as e:
+        logging.error(f"error loading cleansing rules {e}")
+        raise
+
+
+def _rule_name(rule: dict, kind: str) -> str:
+    """return the configured name of a rule, or describe it by kind and column"""
+    return rule.get("name", f"{kind} {rule.get('column', 'all columns')}")
+
+
+def _compose_mappings(first: dict, second: dict) -> dict:
+    """fuse two remaps applied one after another into a single mapping"""
+    fused = dict(second)
+    for key, value in first.items():
+        fused[key] = second.get(value, value)
+    return fused
+
+
+def compile_rules(rules: dict) -> dict:
+    """fuse declared rules into the fewest passes: one mask, one map per column
+
+    select_rows applies the filters, column drops and renames, remap_values
+    the remaps, both through a dataframe engine. apply_values then runs
+    replacements, overrides, scales and casts in pandas.
+
+    overrides of a column are applied together, so every condition sees the
+    values from before any override and the last matching rule wins, as if
+    the overrides were applied one after another in config order.
+    """
+    plan = {
+        "drop_columns": rules.get("drop_columns", []),
+        "rename_columns": rules.get("rename_columns", {}),
+        "filters": [
+            (_rule_name(rule, rule["type"]), rule) for rule in rules.get("filters", [])
+        ],
+        "replacements": [
+            (_rule_name(rule, "replace"), rule)
+            for rule in rules.get("replacements", [])
+        ],
+        "remaps": {},
+        "remap_rules": {},
+        "overrides": {},
+        "scales": {},
+        "scale_rules": {},
+        "casts": rules.get("casts", {}),
+    }
+
+    # remaps of the same column collapse into one mapping applied in one pass
+    for rule in rules.get("remaps", []):
+        column = rule["column"]
+        plan["remaps"][column] = _compose_mappings(
+            plan["remaps"].get(column, {}), rule["mapping"]
+        )
+        plan["remap_rules"].setdefault(column, []).append(
+            (_rule_name(rule, "remap"), rule["mapping"])
+        )
+
+    # overrides of the same column become one np.select
+    for rule in rules.get("overrides", []):
+        plan["overrides"].setdefault(rule["column"], []).append(
+            (_rule_name(rule, "override"), rule["when"], rule["value"])
+        )
+
+    # scales of the same column multiply into one factor
+    for rule in rules.get("scales", []):
+        column = rule["column"]
+        plan["scales"][column] = plan["scales"].get(column, 1) * rule["factor"]
+        plan["scale_rules"].setdefault(column, []).append(_rule_name(rule, "scale"))
+
+    return plan
+
+
+def select_rows(engine, df, plan: dict, hits: dict):
+    """apply every row filter as one mask, then drop and rename columns once"""
+    all_columns = engine.columns(df)
+    kept_columns = [c for c in all_columns if c not in plan["drop_columns"]]
+
+    # missing value filters look at the kept columns unless told otherwise
+    rules = [
+        {"columns": kept_columns, **rule} if rule["type"] == "not_null" else rule
+        for _, rule in plan["filters"]
+    ]
+
+    # read only the kept columns and the ones a filter needs
+    needed = set(kept_columns)
+    for rule in rules:
+        needed.update(rule.get("columns", [rule.get("column")]))
+    df = engine.select(df, [c for c in all_columns if c in needed])
+
+    df, dropped = engine.filter_rows(df, rules)
+    for (name, _), count in zip(plan["filters"], dropped):
+        hits[name] = count
+    hits["drop columns"] = len(all_columns) - len(kept_columns)
+
+    df = engine.select(df, kept_columns)
+    return engine.rename(df, plan["rename_columns"])
+
+
+def _remap_hits(counts: pd.Series, rules: list, hits: dict) -> None:
+    """count the cells each remap rule touches, walking only the unique values"""
+    stage = pd.Series(counts.index, index=counts.index)
+
+    for name, mapping in rules:
+        matched = stage.isin(mapping.keys())
+        hits[name] = int(counts[matched.to_numpy()].sum())
+        stage = stage.map(lambda value: mapping.get(value, value))
+
+
+def remap_values(engine, df, plan: dict, hits: dict):
+    """apply the fused remaps, one mapping per column"""
+    for column, mapping in plan["remaps"].items():
+        _remap_hits(engine.value_counts(df, column), plan["remap_rules"][column], hits)
+        df = engine.remap(df, column, mapping)
+
+    return df
+
+
+def apply_values(df: pd.DataFrame, plan: dict, hits: dict) -> pd.DataFrame:
+    """apply replacements, overrides, scales and casts"""
+    for name, rule in plan["replacements"]:
+        column = df[rule["column"]]
+        replaced = column.str.replace(
+            rule["pattern"], rule["value"], regex=rule.get("regex", False)
+        )
+        hits[name] = int((replaced != column).sum())
+        df[rule["column"]] = replaced
+
+    # every override condition sees the values before any override is applied
+    conditions = {}
+    for column, rules in plan["overrides"].items():
+        conditions[column] = []
+        for name, when, value in rules:
+            condition = np.ones(len(df), dtype=bool)
+            for when_column, when_value in when.items():
+                condition &= (df[when_column] == when_value).to_numpy()
+            hits[name] = int(condition.sum())
+            conditions[column].append((condition, value))
+
+    # np.select takes the first match, so later rules go first to win
+    for column, column_conditions in conditions.items():
+        df[column] = np.select(
+            [condition for condition, _ in reversed(column_conditions)],
+            [value for _, value in reversed(column_conditions)],
+            default=df[column].to_numpy(dtype=object),
+        )
+
+    for column, factor in plan["scales"].items():
+        for name in plan["scale_rules"][column]:
+            hits[name] = int(df[column].notna().sum())
+        df[column] = df[column] * factor
+
+    for column, dtype in plan["casts"].items():
+        cast = df[column].astype(dtype)
+        hits[f"cast {column}"] = len(cast) if cast.dtype != df[column].dtype else 0
+        df[column] = cast
+
+    return df
+
+
+def report_hits(hits: dict) -> None:
+    """log how many rows, columns or cells each rule touched"""
+    for name, count in hits.items():
+        logging.info(f"rule '{name}' hit {count}")
@@ -0,0 +1,234 @@
+import logging
+import os
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+
+
+# shared memory blocks created or already mapped by this process
+created_blocks = {}
+attached_blocks = {}
+
+
+def _column_array(series: pd.Series) -> tuple:
+    """return a column as a fixed-width array plus its categories, if any"""
+    if pd.api.types.is_numeric_dtype(series) and not isinstance(
+        series.dtype, pd.CategoricalDtype
+    ):
+        # nullable columns travel as plain numpy, missing values become nan
+        if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            if series.hasnans:
+                return series.to_numpy(dtype=float, na_value=np.nan), None
+            return series.to_numpy(dtype=series.dtype.numpy_dtype), None
+        return series.to_numpy(), None
+
+    # text columns travel as integer codes, categories are small enough to pickle
+    categorical = pd.Categorical(series)
+    return categorical.codes, list(categorical.categories)
+
+
+def share_frame(df: pd.DataFrame, columns: list = None) -> tuple:
+    """copy the given columns into shared memory once and return a picklable handle"""
+    columns = list(df.columns) if columns is None else columns
+    handle = {"length": len(df), "columns": []}
+    blocks = []
+
+    try:
+        for column in columns:
+            array, categories = _column_array(df[column])
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            blocks.append(block)
+            created_blocks[block.name] = block
+
+            handle["columns"].append(
+                {
+                    "name": column,
+                    "block": block.name,
+                    "dtype": array.dtype.str,
+                    "categories": categories,
+                }
+            )
+    except Exception as e:
+        logging.error(f"error sharing dataframe: {e}")
+        release(blocks, unlink=True)
+        raise
+
+    return handle, blocks
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """map a shared memory block once per process and keep it mapped until unused"""
+    if name in created_blocks:
+        return created_blocks[name]
+    if name not in attached_blocks:
+        try:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # before python 3.13 attaching registers the block for cleanup. a
+            # worker with its own tracker would unlink it under the owner, and
+            # unregistering would drop the owner's entry from a shared tracker,
+            # so registration is skipped instead
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args, **kwargs: None
+            try:
+                block = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        attached_blocks[name] = block
+    return attached_blocks[name]
+
+
+def _close_unused(names: list) -> None:
+    """unmap attached blocks that no frame in this process still uses"""
+    for name in names:
+        try:
+            attached_blocks[name].close()
+        except BufferError:
+            # a live frame still points into the block
+            continue
+        del attached_blocks[name]
+
+
+def detach(handle: dict = None) -> None:
+    """unmap the blocks of a handle, or of every handle, in a worker
+
+    memory the owner unlinked is only given back once every process that
+    mapped it has closed its mapping.
+    """
+    if handle is None:
+        names = list(attached_blocks)
+    else:
+        names = [
+            column["block"]
+            for column in handle["columns"]
+            if column["block"] in attached_blocks
+        ]
+    _close_unused(names)
+
+
+def attach_frame(handle: dict) -> pd.DataFrame:
+    """map a shared frame in a worker without copying the column data
+
+    blocks of earlier handles are unmapped once no frame uses them, so
+    long-lived workers do not hold on to released memory.
+    """
+    current = {column["block"] for column in handle["columns"]}
+    _close_unused([name for name in attached_blocks if name not in current])
+
+    data = {}
+
+    for column in handle["columns"]:
+        block = _attach_block(column["block"])
+        array = np.ndarray(
+            (handle["length"],), dtype=np.dtype(column["dtype"]), buffer=block.buf
+        )
+
+        if column["categories"] is None:
+            data[column["name"]] = pd.Series(array, copy=False)
+        else:
+            categorical = pd.Categorical.from_codes(
+                array, column["categories"], validate=False
+            )
+            data[column["name"]] = pd.Series(categorical, copy=False)
+
+    return pd.DataFrame(data, copy=False)
+
+
+def release(blocks: list, unlink: bool = False) -> None:
+    """close shared memory blocks created by share_frame and unlink them if asked
+
+    frames attached to the blocks in this process must be dropped first.
+    """
+    for block in blocks:
+        created_blocks.pop(block.name, None)
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def write_arrow(df: pd.DataFrame, path: str) -> None:
+    """write a frame as an uncompressed arrow ipc file that workers can memory-map"""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        logging.error("pyarrow is required to write arrow ipc files")
+        raise
+
+    try:
+        arrays = []
+        for column in df.columns:
+            array, categories = _column_array(df[column])
+            if categories is None:
+                arrays.append(pa.array(array))
+            else:
+                # missing values are code -1, which arrow stores as null indices
+                indices = pa.array(array, mask=array < 0)
+                arrays.append(
+                    pa.DictionaryArray.from_arrays(indices, pa.array(categories))
+                )
+
+        table = pa.Table.from_arrays(arrays, names=list(df.columns))
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with pa.OSFile(path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        logging.info("successfully saved arrow data")
+    except Exception as e:
+        logging.error(f"error saving data to arrow {e}")
+        raise
+
+
+def map_arrow(path: str) -> pd.DataFrame:
+    """memory-map an arrow ipc file written by write_arrow without copying"""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        logging.error("pyarrow is required to read arrow ipc files")
+        raise
+
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+    data = {}
+    for name, column in zip(table.column_names, table.columns):
+        chunk = column.chunk(0)
+        if pa.types.is_dictionary(chunk.type):
+            indices = chunk.indices
+            if indices.null_count:
+                # null indices need a copy to turn back into code -1
+                codes = indices.fill_null(-1).to_numpy()
+            else:
+                codes = indices.to_numpy(zero_copy_only=True)
+            categorical = pd.Categorical.from_codes(
+                codes, chunk.dictionary.to_pylist(), validate=False
+            )
+            data[name] = pd.Series(categorical, copy=False)
+        elif pa.types.is_boolean(chunk.type) or chunk.null_count:
+            # bit-packed booleans and null bitmaps have no numpy layout, so copy
+            data[name] = pd.Series(chunk.to_numpy(zero_copy_only=False), copy=False)
+        else:
+            data[name] = pd.Series(chunk.to_numpy(zero_copy_only=True), copy=False)
+
+    return pd.DataFrame(data, copy=False)
+
+
+def as_frame(source) -> pd.DataFrame:
+    """accept a dataframe, a shared memory handle or an arrow ipc path"""
+    if isinstance(source, pd.DataFrame):
+        return source
+    if isinstance(source, dict):
+        return attach_frame(source)
+    if isinstance(source, str):
+        return map_arrow(source)
+
+    raise TypeError(f"unsupported frame source: {type(source).__name__}")